@@ -0,0 +1,121 @@
+"""
+Micro-benchmark for the per-issue work of the Jira issue input
+
+Compares the former per-issue processing (field list split per page,
+strptime and json.dumps per issue, event metadata looked up per event)
+with the precompiled IssuePlan on synthetic Jira issues.
+
+Usage: python benchmarks/bench_issue_plan.py [num_issues]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "package", "bin"))
+
+from issue_plan import IssuePlan  # noqa: E402
+
+ISSUE_FIELDS = "summary, status, assignee, reporter, priority, labels, worklog, updated"
+PAGE_SIZE = 50
+
+
+def generate_issues(num_issues: int) -> list:
+    rnd = random.Random(42)
+    base_time = datetime(2023, 1, 1, tzinfo=timezone(timedelta(hours=1)))
+    issues = []
+    for i in range(num_issues):
+        updated = base_time + timedelta(
+            seconds=rnd.randint(0, 10**7), milliseconds=rnd.randint(0, 999)
+        )
+        issues.append(
+            {
+                "id": str(10000 + i),
+                "key": "SD-{}".format(i),
+                "fields": {
+                    "summary": "Synthetic issue {}".format(i),
+                    "status": {"name": rnd.choice(["Open", "In Progress", "Done"])},
+                    "assignee": {"name": "user{}".format(rnd.randint(0, 50))},
+                    "reporter": {"name": "user{}".format(rnd.randint(0, 50))},
+                    "priority": {"name": rnd.choice(["Low", "Medium", "High"])},
+                    "labels": ["label{}".format(rnd.randint(0, 10)) for _ in range(3)],
+                    "worklog": {"startAt": 0, "maxResults": 20, "total": 0, "worklogs": []},
+                    "updated": updated.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
+                    + updated.strftime("%z"),
+                },
+            }
+        )
+    return issues
+
+
+def run_baseline(issues: list, input_item: dict, source: str) -> list:
+    events = []
+    for page_start in range(0, len(issues), PAGE_SIZE):
+        page = issues[page_start : page_start + PAGE_SIZE]
+        if "worklog" in [field.strip() for field in input_item["issue_fields"].split(",")]:
+            pass
+        for issue in page:
+            updated = datetime.strptime(issue["fields"]["updated"], "%Y-%m-%dT%H:%M:%S.%f%z")
+            events.append(
+                dict(
+                    data=json.dumps(issue),
+                    time=updated.timestamp(),
+                    index=input_item["index"],
+                    source=source,
+                    sourcetype="jira:issue",
+                    done=True,
+                    unbroken=True,
+                )
+            )
+    return events
+
+
+def run_plan(issues: list, input_item: dict, source: str) -> list:
+    events = []
+    issue_plan = IssuePlan(input_item["issue_fields"], None, input_item["index"], source)
+    for page_start in range(0, len(issues), PAGE_SIZE):
+        page = issues[page_start : page_start + PAGE_SIZE]
+        if issue_plan.collect_worklogs:
+            pass
+        for issue in page:
+            updated = issue_plan.parse_updated(issue["fields"]["updated"])
+            events.append(
+                dict(
+                    data=issue_plan.encode(issue),
+                    time=updated.timestamp(),
+                    **issue_plan.event_metadata,
+                )
+            )
+    return events
+
+
+def main():
+    num_issues = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    issues = generate_issues(num_issues)
+    input_item = {"issue_fields": ISSUE_FIELDS, "index": "jira"}
+    source = "bench_input"
+
+    results = {}
+    for name, func in (("baseline", run_baseline), ("issue_plan", run_plan)):
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            events = func(issues, input_item, source)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (best, events)
+        print("{:<12} {:>8.3f}s  ({:.0f} issues/s)".format(name, best, num_issues / best))
+
+    # both paths have to produce identical events
+    baseline_events, plan_events = results["baseline"][1], results["issue_plan"][1]
+    assert baseline_events == plan_events
+
+    print("speedup: {:.2f}x".format(results["baseline"][0] / results["issue_plan"][0]))
+
+
+if __name__ == "__main__":
+    main()
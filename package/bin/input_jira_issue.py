@@ -1,12 +1,15 @@
 # encoding = utf-8
 import sys
 import base64
-import json
+import os
 import re
 import logging
 
 import ta_helper
 
+from issue_plan import IssuePlan
+from worklog_cache import WorklogCache
+
 from splunklib import modularinput as smi
 from splunktaucclib.rest_handler.error import RestError
 from solnlib import log
@@ -209,6 +212,21 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
         num_issues_indexed = 0
         last_updated_time = datetime.fromtimestamp(checkpoint_value / 1000, tz=timezone.utc)
 
+        # precompile per-input settings used for every page and issue
+        issue_plan = IssuePlan(
+            opt_issue_fields, opt_expand_fields, input_item["index"], normalized_input_name
+        )
+
+        # initialize worklog cache used by the JRASERVER-34746 workaround
+        worklog_cache = None
+        if issue_plan.collect_worklogs:
+            worklog_cache = WorklogCache(
+                logger,
+                os.path.join(
+                    inputs.metadata["checkpoint_dir"], "worklog_cache", normalized_input_name
+                ),
+            )
+
         while new_issues_fetched:
             # get Jira issues via REST API
             logger.info(
@@ -219,13 +237,13 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
 
             request_params = {
                 "jql": opt_jql,
-                "fields": "updated,{}".format(opt_issue_fields.replace(" ", "")),
+                "fields": issue_plan.request_fields,
                 "validateQuery": "true",
                 "startAt": start_at,
             }
 
-            if opt_expand_fields:
-                request_params["expand"] = opt_expand_fields.replace(" ", "")
+            if issue_plan.request_expand:
+                request_params["expand"] = issue_plan.request_expand
 
             logger.debug("Request parameters for Jira REST API: {}".format(request_params))
 
@@ -294,7 +312,7 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                 new_issues_fetched = False
 
             # workaround for bug JRASERVER-34746 (worklog field is limited to 20 results)
-            if "worklog" in [field.strip() for field in opt_issue_fields.split(",")]:
+            if issue_plan.collect_worklogs:
                 for issue in jira_issues:
                     if (
                         ("worklog" in issue["fields"])
@@ -306,6 +324,19 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                         worklog_total = issue["fields"]["worklog"]["total"]
 
                         if worklog_total > worklog_max_results:
+                            # use cached worklogs if the total and the returned worklogs
+                            # did not change since they were fetched - the search API only
+                            # returns the first worklogs, so edits of later worklogs are
+                            # only picked up once the cache entry expires
+                            worklog_version = WorklogCache.get_version(issue["fields"]["worklog"])
+                            cached_worklog = worklog_cache.get(issue["key"], worklog_version)
+                            if cached_worklog is not None:
+                                logger.debug(
+                                    "Using cached worklogs for issue {}".format(issue["key"])
+                                )
+                                issue["fields"]["worklog"] = cached_worklog
+                                continue
+
                             logger.debug(
                                 "The issue {} contains more than {} worklogs. Fetching all worklogs ...".format(
                                     issue["key"], worklog_max_results
@@ -349,6 +380,10 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
                                 )
                                 continue
 
+                            worklog_cache.put(
+                                issue["key"], worklog_version, issue["fields"]["worklog"]
+                            )
+
             # API pagination
             start_at = start_at + response_data["maxResults"]
 
@@ -356,9 +391,7 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
             for issue in jira_issues:
                 # extract updated timestamp
                 try:
-                    updated = datetime.strptime(
-                        issue["fields"]["updated"], "%Y-%m-%dT%H:%M:%S.%f%z"
-                    )
+                    updated = issue_plan.parse_updated(issue["fields"]["updated"])
                 except ValueError as exc:
                     log.log_exception(
                         logger,
@@ -370,13 +403,9 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
 
                 try:
                     event = smi.Event(
-                        data=json.dumps(issue),
+                        data=issue_plan.encode(issue),
                         time=updated.timestamp(),
-                        index=input_item["index"],
-                        source=normalized_input_name,
-                        sourcetype="jira:issue",
-                        done=True,
-                        unbroken=True,
+                        **issue_plan.event_metadata,
                     )
                     event_writer.write_event(event)
                 except Exception as exc:
@@ -0,0 +1,62 @@
+"""
+Precompiled per-input settings used when indexing Jira issues
+"""
+
+import json
+
+from datetime import datetime
+
+
+class IssuePlan:
+    """
+    This class holds everything the indexing loop of an input needs per
+    issue, computed once per input run instead of once per page or issue.
+    """
+
+    def __init__(self, issue_fields: str, expand_fields: str, index: str, source: str):
+        self.issue_fields = frozenset(field.strip() for field in issue_fields.split(","))
+        self.collect_worklogs = "worklog" in self.issue_fields
+
+        # request parameters that are the same for every API page
+        self.request_fields = "updated,{}".format(issue_fields.replace(" ", ""))
+        self.request_expand = expand_fields.replace(" ", "") if expand_fields else None
+
+        # metadata that is the same for every Splunk event
+        self.event_metadata = {
+            "index": index,
+            "source": source,
+            "sourcetype": "jira:issue",
+            "done": True,
+            "unbroken": True,
+        }
+
+        # this is equivalent to json.dumps and only exists so the plan is the single place
+        # that defines the raw event format (default separators as in previous versions)
+        self.encode = json.JSONEncoder().encode
+
+    @staticmethod
+    def parse_updated(updated: str) -> datetime:
+        """
+        This function parses a Jira datetime string like
+        2023-03-13T15:21:02.404+0100.
+
+        Strings in exactly this layout are parsed with datetime.fromisoformat,
+        all other strings with datetime.strptime, so both accept the same input.
+
+        Raises ValueError if the datetime string can't be parsed.
+        """
+        # datetime.fromisoformat only accepts UTC offsets with a colon before Python 3.11
+        # and is more lenient than strptime, so the separators are checked beforehand
+        if (
+            len(updated) == 28
+            and updated[10] == "T"
+            and updated[19] == "."
+            and updated[23] in "+-"
+            and updated[26] in "012345"
+        ):
+            try:
+                return datetime.fromisoformat(updated[:26] + ":" + updated[26:])
+            except ValueError:
+                pass
+
+        return datetime.strptime(updated, "%Y-%m-%dT%H:%M:%S.%f%z")
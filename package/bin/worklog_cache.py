@@ -0,0 +1,222 @@
+"""
+On-disk cache for complete Jira issue worklog lists
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+from collections import OrderedDict
+from solnlib import log
+
+
+class WorklogCache:
+    """
+    This class stores the complete worklog list of Jira issues on disk, so the
+    workaround for JRASERVER-34746 only has to re-fetch worklogs of an issue
+    when its worklogs changed.
+
+    Every issue is stored in its own JSON file together with the worklog
+    total and the ids and updated times of the worklogs returned by the
+    search API. The search API only returns the first worklogs of an issue,
+    so changes to later worklogs that keep the total the same are not
+    detected. To limit such stale data, entries expire after max_age_seconds.
+
+    The cache directory is bounded by size and evicts the least recently
+    used entries first.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        cache_dir: str,
+        max_size_bytes: int = 50 * 1024 * 1024,
+        max_age_seconds: int = 24 * 60 * 60,
+    ):
+        self.logger = logger
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.max_age_seconds = max_age_seconds
+
+        # cache file paths and sizes ordered from least to most recently used
+        self.entries = OrderedDict()
+        self.cache_size = 0
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_entries()
+        except OSError as exc:
+            log.log_exception(
+                logger,
+                exc,
+                "Worklog Cache Error",
+                msg_before=f"Unable to initialize worklog cache directory {cache_dir} - worklogs will not be cached",
+                log_level=logging.WARNING,
+            )
+            self.cache_dir = None
+
+    def _load_entries(self):
+        """
+        This function scans the cache directory once to initialize the LRU
+        order and removes leftover files of interrupted writes.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file():
+                continue
+
+            if entry.name.endswith(".tmp"):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            elif entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+
+        for _, path, size in sorted(entries):
+            self.entries[path] = size
+            self.cache_size = self.cache_size + size
+
+        self._evict()
+
+    @staticmethod
+    def get_version(worklog: dict):
+        """
+        This function returns the version of a worklog field as reported by
+        the search API: its total and the ids and updated times of the
+        returned worklogs.
+
+        The updated times are compared as they are instead of picking the
+        newest one, because Jira timestamps with different UTC offsets
+        can't be ordered as strings.
+        """
+        worklog_updates = [
+            [entry.get("id"), entry.get("updated")] for entry in worklog.get("worklogs", [])
+        ]
+        return worklog.get("total"), worklog_updates
+
+    def _get_path(self, issue_key: str) -> str:
+        return os.path.join(
+            self.cache_dir, "{}.json".format(re.sub("[^a-zA-Z0-9_-]", "_", issue_key))
+        )
+
+    def get(self, issue_key: str, version) -> dict:
+        """
+        This function returns the cached worklog of an issue if the cached
+        version matches the given version and the entry has not expired.
+
+        Returns None if the issue is not cached or the cached worklog is outdated.
+        """
+        if self.cache_dir is None:
+            return None
+
+        path = self._get_path(issue_key)
+        if path not in self.entries:
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError) as exc:
+            log.log_exception(
+                self.logger,
+                exc,
+                "Worklog Cache Error",
+                msg_before=f"Unable to read cached worklogs of issue {issue_key}",
+                log_level=logging.WARNING,
+            )
+            self._remove(path)
+            return None
+
+        if (
+            not isinstance(entry, dict)
+            or entry.get("issue_key") != issue_key
+            or [entry.get("total"), entry.get("worklog_updates")] != list(version)
+        ):
+            return None
+
+        if time.time() - entry.get("cached_at", 0) > self.max_age_seconds:
+            self.logger.debug("The cached worklogs of issue {} have expired".format(issue_key))
+            return None
+
+        # mark entry as recently used
+        self.entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry.get("worklog")
+
+    def put(self, issue_key: str, version, worklog: dict):
+        """
+        This function stores the complete worklog of an issue with the
+        given version and evicts least recently used entries if the cache
+        exceeds its maximum size.
+        """
+        if self.cache_dir is None:
+            return
+
+        entry = {
+            "issue_key": issue_key,
+            "total": version[0],
+            "worklog_updates": version[1],
+            "cached_at": int(time.time()),
+            "worklog": worklog,
+        }
+        path = self._get_path(issue_key)
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                    json.dump(entry, cache_file, separators=(",", ":"))
+                size = os.path.getsize(tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError as exc:
+            log.log_exception(
+                self.logger,
+                exc,
+                "Worklog Cache Error",
+                msg_before=f"Unable to cache worklogs of issue {issue_key}",
+                log_level=logging.WARNING,
+            )
+            return
+
+        self.cache_size = self.cache_size - self.entries.pop(path, 0) + size
+        self.entries[path] = size
+
+        self._evict()
+
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return False
+
+        self.cache_size = self.cache_size - self.entries.pop(path, 0)
+        return True
+
+    def _evict(self):
+        """
+        This function removes the least recently used entries until the
+        cache fits into its maximum size.
+        """
+        for path in list(self.entries):
+            if self.cache_size <= self.max_size_bytes:
+                break
+
+            if self._remove(path):
+                self.logger.debug("Evicted cached worklogs {}".format(os.path.basename(path)))
@@ -0,0 +1,89 @@
+import json
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from issue_plan import IssuePlan
+
+
+def _strptime(updated):
+    return datetime.strptime(updated, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+@pytest.mark.parametrize(
+    "updated, offset",
+    [
+        ("2023-03-13T15:21:02.404+0100", timedelta(hours=1)),
+        ("2023-03-13T15:21:02.404+0530", timedelta(hours=5, minutes=30)),
+        ("2023-03-13T15:21:02.404-0500", timedelta(hours=-5)),
+        ("2023-03-13T15:21:02.404-0930", -timedelta(hours=9, minutes=30)),
+        ("2023-03-13T15:21:02.404+0000", timedelta(0)),
+        ("2023-03-13T15:21:02.404-0000", timedelta(0)),
+    ],
+)
+def test_parse_updated_handles_utc_offsets(updated, offset):
+    parsed = IssuePlan.parse_updated(updated)
+
+    assert parsed == datetime(2023, 3, 13, 15, 21, 2, 404000, tzinfo=timezone(offset))
+    assert parsed.utcoffset() == offset
+    assert parsed == _strptime(updated)
+
+
+@pytest.mark.parametrize(
+    "updated",
+    [
+        "2023-03-13T15:21:02.404123+0100",
+        "2023-03-13T15:21:02.4+0100",
+        "2023-03-13T15:21:02.404Z",
+        "2023-03-13T15:21:02.404+01:00",
+    ],
+)
+def test_parse_updated_falls_back_to_strptime(updated):
+    assert IssuePlan.parse_updated(updated) == _strptime(updated)
+
+
+@pytest.mark.parametrize(
+    "updated",
+    [
+        "",
+        "not a timestamp",
+        "2023-03-13 15:21:02.404+0100",
+        "2023-03-13T15:21:02,404+0100",
+        "2023-03-13T15:21:02.404+0160",
+        "2023-03-13T24:00:00.000+0000",
+        "2023-02-30T15:21:02.404+0100",
+        "2023-03-13T15:21:02.404",
+        "2023-03-13T15:21:02+0100",
+    ],
+)
+def test_parse_updated_rejects_invalid_strings(updated):
+    with pytest.raises(ValueError):
+        IssuePlan.parse_updated(updated)
+
+
+def test_issue_plan_precompiles_input_settings():
+    issue_plan = IssuePlan("summary, worklog ,status", "changelog, names", "jira", "my_input")
+
+    assert issue_plan.issue_fields == {"summary", "worklog", "status"}
+    assert issue_plan.collect_worklogs
+    assert issue_plan.request_fields == "updated,summary,worklog,status"
+    assert issue_plan.request_expand == "changelog,names"
+    assert issue_plan.event_metadata == {
+        "index": "jira",
+        "source": "my_input",
+        "sourcetype": "jira:issue",
+        "done": True,
+        "unbroken": True,
+    }
+
+    issue_plan = IssuePlan("summary,worklogs", None, "jira", "my_input")
+
+    assert not issue_plan.collect_worklogs
+    assert issue_plan.request_expand is None
+
+
+def test_encode_keeps_raw_event_format():
+    issue = {"key": "SD-1", "fields": {"summary": "Ünïcode", "labels": ["a", "b"]}}
+
+    assert IssuePlan("summary", None, "jira", "my_input").encode(issue) == json.dumps(issue)
@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import time
+
+import pytest
+
+pytest.importorskip("solnlib")
+
+from worklog_cache import WorklogCache  # noqa: E402
+
+LOGGER = logging.getLogger("test_worklog_cache")
+
+
+def _worklog(total, *updated_times):
+    return {
+        "startAt": 0,
+        "maxResults": 20,
+        "total": total,
+        "worklogs": [{"id": str(i), "updated": updated} for i, updated in enumerate(updated_times)],
+    }
+
+
+def _set_mtimes(cache, *issue_keys):
+    # give cache files distinct, increasing modification times
+    for offset, issue_key in enumerate(issue_keys):
+        os.utime(cache._get_path(issue_key), (1000 + offset, 1000 + offset))
+
+
+def _version(worklog):
+    return WorklogCache.get_version(worklog)
+
+
+def test_get_version_uses_total_and_returned_worklogs():
+    worklog = _worklog(30, "2023-01-02T10:00:00.000+0000", "2023-03-01T10:00:00.000+0000")
+
+    assert WorklogCache.get_version(worklog) == (
+        30,
+        [["0", "2023-01-02T10:00:00.000+0000"], ["1", "2023-03-01T10:00:00.000+0000"]],
+    )
+    assert WorklogCache.get_version({"total": 0, "worklogs": []}) == (0, [])
+
+
+def test_get_returns_worklog_only_for_matching_version(tmp_path):
+    cache = WorklogCache(LOGGER, str(tmp_path))
+    worklog = _worklog(30, "2023-03-01T10:00:00.000+0000")
+    cache.put("SD-1", _version(worklog), worklog)
+
+    assert cache.get("SD-1", _version(worklog)) == worklog
+    assert cache.get("SD-1", _version(_worklog(31, "2023-03-01T10:00:00.000+0000"))) is None
+    assert cache.get("SD-1", _version(_worklog(30, "2023-03-02T10:00:00.000+0000"))) is None
+    assert cache.get("SD-2", _version(worklog)) is None
+
+
+def test_get_detects_edits_with_different_utc_offsets(tmp_path):
+    # 09:30+0000 is later than 10:00+0100, although it sorts lower as a string
+    cache = WorklogCache(LOGGER, str(tmp_path))
+    worklog = _worklog(30, "2023-03-26T10:00:00.000+0100", "2023-03-26T09:00:00.000+0000")
+    cache.put("SD-1", _version(worklog), worklog)
+
+    edited_worklog = _worklog(30, "2023-03-26T10:00:00.000+0100", "2023-03-26T09:30:00.000+0000")
+
+    assert cache.get("SD-1", _version(edited_worklog)) is None
+
+
+def test_get_ignores_expired_entries(tmp_path):
+    cache = WorklogCache(LOGGER, str(tmp_path), max_age_seconds=60)
+    worklog = _worklog(30, "2023-03-01T10:00:00.000+0000")
+    version = _version(worklog)
+    cache.put("SD-1", version, worklog)
+
+    path = cache._get_path("SD-1")
+    with open(path, "r", encoding="utf-8") as cache_file:
+        entry = json.load(cache_file)
+    entry["cached_at"] = int(time.time()) - 120
+    with open(path, "w", encoding="utf-8") as cache_file:
+        json.dump(entry, cache_file)
+
+    assert cache.get("SD-1", version) is None
+
+
+def test_put_evicts_least_recently_used_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr("worklog_cache.time.time", lambda: 1700000000)
+    worklog = _worklog(30, "2023-03-01T10:00:00.000+0000")
+
+    cache = WorklogCache(LOGGER, str(tmp_path))
+    for issue_key in ("SD-1", "SD-2", "SD-3"):
+        cache.put(issue_key, _version(worklog), worklog)
+    _set_mtimes(cache, "SD-1", "SD-2", "SD-3")
+    max_size_bytes = sum(
+        os.path.getsize(cache._get_path(issue_key)) for issue_key in ("SD-1", "SD-2", "SD-3")
+    )
+
+    # reload the cache to restore the LRU order from disk and use SD-1
+    cache = WorklogCache(LOGGER, str(tmp_path), max_size_bytes=max_size_bytes)
+    assert cache.get("SD-1", _version(worklog)) is not None
+
+    cache.put("SD-4", _version(worklog), worklog)
+
+    assert sorted(os.listdir(str(tmp_path))) == ["SD-1.json", "SD-3.json", "SD-4.json"]
+    assert cache.cache_size == sum(
+        os.path.getsize(os.path.join(str(tmp_path), name)) for name in os.listdir(str(tmp_path))
+    )
+
+
+def test_init_removes_leftover_temporary_files(tmp_path):
+    (tmp_path / "tmpabc123.tmp").write_text("{")
+
+    WorklogCache(LOGGER, str(tmp_path))
+
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_get_drops_corrupt_entries(tmp_path):
+    cache = WorklogCache(LOGGER, str(tmp_path))
+    worklog = _worklog(30, "2023-03-01T10:00:00.000+0000")
+    version = _version(worklog)
+    cache.put("SD-1", version, worklog)
+
+    with open(cache._get_path("SD-1"), "w", encoding="utf-8") as cache_file:
+        cache_file.write("{not json")
+
+    assert cache.get("SD-1", version) is None
+    assert not os.path.exists(cache._get_path("SD-1"))
+    assert cache.cache_size == 0
+
+
+def test_unusable_cache_directory_disables_cache(tmp_path):
+    cache_dir = tmp_path / "worklog_cache"
+    cache_dir.write_text("not a directory")
+
+    cache = WorklogCache(LOGGER, str(cache_dir))
+    worklog = _worklog(30, "2023-03-01T10:00:00.000+0000")
+    version = _version(worklog)
+    cache.put("SD-1", version, worklog)
+
+    assert cache.cache_dir is None
+    assert cache.get("SD-1", version) is None
+
+
+def test_put_failure_keeps_cache_usable(tmp_path, monkeypatch):
+    cache = WorklogCache(LOGGER, str(tmp_path))
+    worklog = _worklog(30, "2023-03-01T10:00:00.000+0000")
+    version = _version(worklog)
+
+    def read_only_mkstemp(*args, **kwargs):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr("worklog_cache.tempfile.mkstemp", read_only_mkstemp)
+    cache.put("SD-1", version, worklog)
+
+    assert cache.get("SD-1", version) is None
+    assert cache.cache_size == 0